@@ -1,16 +1,31 @@
 import argparse
 import hashlib
 import json
-import re
+import mmap
+import os
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
 KEY_VERSION = "version"
 KEY_VIDEOS = "videos"
 KEY_ORIGINAL_FILENAME = "original"
@@ -18,6 +33,35 @@ KEY_START = "start"
 KEY_END = "end"
 KEY_CLIPS = "clips"
 KEY_SHA256_CHECKSUM = "sha256_checksum"
+KEY_MTIME_NS = "mtime_ns"
+KEY_SIZE = "size"
+KEY_HASH_ALG = "hash_alg"
+
+HASH_ALG_SHA256 = "sha256"
+HASH_ALG_BLAKE3 = "blake3"
+# Checksums only detect changed clips. BLAKE3 is several times faster than
+# sha256 and hashes a single file on all cores, so new clips use it if installed
+DEFAULT_HASH_ALG = HASH_ALG_SHA256 if blake3 is None else HASH_ALG_BLAKE3
+
+# Larger reads mean fewer Python round-trips and longer GIL-free hashing
+SHA256_CHUNK_BYTES = 1 << 20
+# Files above this size are memory-mapped and hashed in a single update
+# without copying. Below it the mmap setup costs as much as it saves
+SHA256_MMAP_THRESHOLD_BYTES = 1 << 20
+
+# ffmpeg formats by clip extension whose muxer never seeks back, so piping
+# the output through Python produces the same file. Others (mp4, mkv, ...)
+# rewrite headers at the end and must be written by ffmpeg directly
+STREAMABLE_CLIP_FORMATS = {".ts": "mpegts"}
+
+# Clips of the same video are cut by one ffmpeg process to save the process
+# startup per clip. Each clip is a separate input, so this also bounds the
+# open inputs per process
+FFMPEG_MAX_CLIPS_PER_PROCESS = 8
+
+# Manifest classes exist once per clip, slots drop their per-instance
+# __dict__. Only supported from Python 3.10
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 EXAMPLE_MANIFEST = """\
 Example manifest file:
@@ -40,16 +84,20 @@ Example manifest file:
 """
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class VideoClip:
     filename: str  # relative to output-dir
     start_timestamp: str
     end_timestamp: str
     sha256_checksum: str  # `none` is used for an unknown hash
+    size: "int | None" = None  # bytes, `None` if unknown
+    mtime_ns: "int | None" = None  # when the checksum was taken
+    # Algorithm of sha256_checksum. The key keeps its name for compatibility
+    hash_alg: str = HASH_ALG_SHA256
 
     @staticmethod
     def from_json(
-        clip_name: str, clip_json: dict[str, str]
+        clip_name: str, clip_json: dict[str, Any]
     ) -> "VideoClip | None":
         start_timestamp = clip_json.get(KEY_START)
         if start_timestamp is None:
@@ -66,25 +114,46 @@ class VideoClip:
             return None
 
         sha256_checksum = clip_json.get(KEY_SHA256_CHECKSUM, "none")
+        size = clip_json.get(KEY_SIZE)
+        mtime_ns = clip_json.get(KEY_MTIME_NS)
+        hash_alg = clip_json.get(KEY_HASH_ALG, HASH_ALG_SHA256)
         clip = VideoClip(
-            clip_name, start_timestamp, end_timestamp, sha256_checksum
+            clip_name,
+            start_timestamp,
+            end_timestamp,
+            sha256_checksum,
+            size,
+            mtime_ns,
+            hash_alg,
         )
 
         return clip
 
-    def to_json(self) -> dict[str, str]:
-        return {
+    def to_json(self) -> dict[str, Any]:
+        clip_json: dict[str, Any] = {
             KEY_START: self.start_timestamp,
             KEY_END: self.end_timestamp,
             KEY_SHA256_CHECKSUM: self.sha256_checksum,
         }
+        # Omitted for sha256 so older manifests are saved unchanged
+        if self.hash_alg != HASH_ALG_SHA256:
+            clip_json[KEY_HASH_ALG] = self.hash_alg
+        if self.size is not None:
+            clip_json[KEY_SIZE] = self.size
+        if self.mtime_ns is not None:
+            clip_json[KEY_MTIME_NS] = self.mtime_ns
+        return clip_json
+
+    def is_unchanged(self, stat: os.stat_result) -> bool:
+        """Does the file still have the size and mtime it was hashed at?"""
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
 
     def get_filepath(self, output_dir: Path) -> Path:
         return output_dir / self.filename
 
 
 # TODO: rename to source
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class VideoFile:
     filename: str  # relative to input-dir
     clips: dict[str, VideoClip]
@@ -108,7 +177,8 @@ class VideoFile:
     def to_json(self) -> dict:
         return {
             KEY_CLIPS: {
-                clip.filename: clip.to_json() for clip in self.clips.values()
+                clip_name: clip.to_json()
+                for clip_name, clip in self.clips.items()
             }
         }
 
@@ -125,22 +195,36 @@ class VideoFile:
                 return False
 
         # TODO: more intelligent naming based on timestamps instead of incrementing by one
-        clip_idx = 0
         input_path = Path(self.filename)
+        prefix = f"{input_path.stem}_"
+        suffix = input_path.suffix
+
+        # Single pass over existing names for the highest "{stem}_{idx}{suffix}"
+        next_idx = 0
+        for clip_name in self.clips:
+            if not (
+                clip_name.startswith(prefix) and clip_name.endswith(suffix)
+            ):
+                continue
+            idx = clip_name[len(prefix) : len(clip_name) - len(suffix)]
+            if idx.isdecimal():
+                next_idx = max(next_idx, int(idx) + 1)
 
-        while True:
-            candidate_clip_name = (
-                f"{input_path.stem}_{clip_idx}{input_path.suffix}"
-            )
-            if candidate_clip_name not in self.clips:
-                self.clips[candidate_clip_name] = VideoClip(
-                    candidate_clip_name, begin, end, "none"
-                )
-                return True
-            clip_idx += 1
+        clip_name = f"{prefix}{next_idx}{suffix}"
+        self.clips[clip_name] = VideoClip(clip_name, begin, end, "none")
+        return True
 
 
-@dataclass
+def load_manifest_json(manifest_path: Path) -> dict[str, Any]:
+    if orjson is not None:
+        with open(manifest_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class VideoClipperManifest:
     version: str
     video_files: dict[str, VideoFile]
@@ -148,8 +232,7 @@ class VideoClipperManifest:
     @staticmethod
     def from_json_file(manifest_path: Path) -> "VideoClipperManifest | None":
         try:
-            with open(manifest_path) as f:
-                manifest_json = json.load(f)
+            manifest_json = load_manifest_json(manifest_path)
         except Exception as e:
             print(f"Error loading manifest file {manifest_path}: {e}")
             return None
@@ -190,13 +273,24 @@ class VideoClipperManifest:
         return {
             KEY_VERSION: self.version,
             KEY_VIDEOS: {
-                video.filename: video.to_json()
-                for video in self.video_files.values()
+                video_name: video.to_json()
+                for video_name, video in self.video_files.items()
             },
         }
 
     def sort(self) -> None:
-        self.video_files = dict(sorted(self.video_files.items()))
+        # Comparing the names alone is cheaper than comparing (name, video)
+        # tuples
+        self.video_files = {
+            video_name: self.video_files[video_name]
+            for video_name in sorted(self.video_files)
+        }
+
+    def iter_clips(self) -> Iterator[tuple[VideoFile, VideoClip]]:
+        """Every clip with its video, without building a list of them"""
+        for video_file in self.video_files.values():
+            for clip in video_file.clips.values():
+                yield video_file, clip
 
     def add_new_clip(self, input_filename: str, begin: str, end: str) -> bool:
         """Insert a new clip into the manifest. A new VideoFile will be created if needed."""
@@ -213,31 +307,193 @@ class VideoClipperManifest:
         Does not check clips that have or have not been made
         """
 
+        # One directory read per folder instead of one stat per video
+        listing = DirectoryListing()
+
         for video_file in self.video_files.values():
             video_filepath = video_file.get_filepath(input_dir)
 
-            if not video_filepath.is_file():
+            if not listing.is_file(video_filepath):
                 print(
                     f"Could not locate original file {video_file.filename} at path {video_filepath}"
                 )
                 return False
 
-            for clip in video_file.clips.values():
-                if not is_valid_time_format(clip.start_timestamp):
-                    print(
-                        f"Invalid '{KEY_START}' timestamp for clip {clip.start_timestamp}. Should be of the form 'HH:MM:SS'"
-                    )
-                    return False
-
-                if not is_valid_time_format(clip.end_timestamp):
-                    print(
-                        f"Invalid '{KEY_END}' timestamp for clip {clip.end_timestamp}. Should be of the form 'HH:MM:SS'"
-                    )
-                    return False
+            if not all(map(validate_clip, video_file.clips.values())):
+                return False
 
         return True
 
 
+@dataclass
+class HashCache:
+    """Checksums of files keyed by absolute path. An entry is only trusted
+    while the file's mtime and size are unchanged. Only entries of clips in
+    the manifest are saved
+    """
+
+    entries: dict[str, dict[str, Any]]
+
+    @staticmethod
+    def get_cache_path(manifest_path: Path) -> Path:
+        return Path(f"{manifest_path}.hashcache.json")
+
+    @staticmethod
+    def from_json_file(cache_path: Path) -> "HashCache":
+        """Load the cache. A missing or unreadable cache is treated as empty"""
+        try:
+            with open(cache_path) as f:
+                return HashCache(json.load(f))
+        except FileNotFoundError:
+            return HashCache({})
+        except Exception as e:
+            print(f"Ignoring unreadable hash cache {cache_path}: {e}")
+            return HashCache({})
+
+    def to_json_file(self, cache_path: Path) -> None:
+        with open(cache_path, "w") as json_file:
+            json.dump(self.entries, json_file)
+
+    def hash_file(
+        self,
+        filepath: Path,
+        hash_alg: str,
+        stat: "os.stat_result | None" = None,
+    ) -> str:
+        """Checksum of filepath, only reading the file if it changed.
+        Pass `stat` if the caller already has it to save a syscall
+        """
+        key = os.path.abspath(filepath)
+        if stat is None:
+            stat = filepath.stat()
+
+        entry = self.entries.get(key)
+        if (
+            entry is not None
+            and entry.get(KEY_MTIME_NS) == stat.st_mtime_ns
+            and entry.get(KEY_SIZE) == stat.st_size
+            and entry.get(KEY_HASH_ALG, HASH_ALG_SHA256) == hash_alg
+        ):
+            return entry[KEY_SHA256_CHECKSUM]
+
+        sha256_checksum = hash_of_file(filepath, hash_alg)
+        self.add(filepath, stat, sha256_checksum, hash_alg)
+        return sha256_checksum
+
+    def add(
+        self,
+        filepath: Path,
+        stat: os.stat_result,
+        sha256_checksum: str,
+        hash_alg: str,
+    ) -> None:
+        """Record a checksum that was computed elsewhere"""
+        self.entries[os.path.abspath(filepath)] = {
+            KEY_MTIME_NS: stat.st_mtime_ns,
+            KEY_SIZE: stat.st_size,
+            KEY_SHA256_CHECKSUM: sha256_checksum,
+            KEY_HASH_ALG: hash_alg,
+        }
+
+    def retain(self, filepaths: Iterable[Path]) -> None:
+        """Drop the entries of all other files, e.g. deleted or renamed clips"""
+        keys = {os.path.abspath(filepath) for filepath in filepaths}
+        self.entries = {
+            key: entry for key, entry in self.entries.items() if key in keys
+        }
+
+
+def load_hash_cache(manifest_path: Path, no_cache: bool) -> "HashCache | None":
+    if no_cache:
+        return None
+    return HashCache.from_json_file(HashCache.get_cache_path(manifest_path))
+
+
+def save_hash_cache(
+    hash_cache: "HashCache | None",
+    manifest_path: Path,
+    manifest: VideoClipperManifest,
+    output_dir: Path,
+    dryrun=False,
+):
+    if hash_cache is None or dryrun:
+        return
+    hash_cache.retain(
+        clip.get_filepath(output_dir) for _, clip in manifest.iter_clips()
+    )
+    hash_cache.to_json_file(HashCache.get_cache_path(manifest_path))
+
+
+@dataclass
+class DirectoryListing:
+    """os.scandir of each directory, read once on first lookup. Answers
+    existence and file type checks without a stat per file
+    """
+
+    entries_by_dir: dict[Path, dict[str, os.DirEntry]] = field(
+        default_factory=dict
+    )
+
+    def get_entry(self, filepath: Path) -> "os.DirEntry | None":
+        parent = filepath.parent
+        entries = self.entries_by_dir.get(parent)
+        if entries is None:
+            entries = scan_directory(parent)
+            self.entries_by_dir[parent] = entries
+        return entries.get(filepath.name)
+
+    def is_file(self, filepath: Path) -> bool:
+        entry = self.get_entry(filepath)
+        if entry is not None:
+            return entry.is_file()
+        # Not listed could still be a case-insensitive match, so stat
+        return filepath.is_file()
+
+    def exists(self, filepath: Path) -> bool:
+        return self.get_entry(filepath) is not None or filepath.exists()
+
+
+def scan_directory(directory: Path) -> dict[str, os.DirEntry]:
+    """Entries of directory by name. Empty if it does not exist"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def check_hash_algs_available(clips: Iterable[VideoClip]) -> bool:
+    """Can the checksums of clips be verified with the installed packages?"""
+    for clip in clips:
+        if clip.hash_alg == HASH_ALG_BLAKE3 and blake3 is None:
+            print(
+                f"Clip {clip.filename} was hashed with {HASH_ALG_BLAKE3}. Install blake3 to verify it"
+            )
+            return False
+        if clip.hash_alg not in (HASH_ALG_SHA256, HASH_ALG_BLAKE3):
+            print(
+                f"Unknown '{KEY_HASH_ALG}' {clip.hash_alg} for clip {clip.filename}"
+            )
+            return False
+    return True
+
+
+def validate_clip(clip: VideoClip) -> bool:
+    if not is_valid_time_format(clip.start_timestamp):
+        print(
+            f"Invalid '{KEY_START}' timestamp for clip {clip.start_timestamp}. Should be of the form 'HH:MM:SS'"
+        )
+        return False
+
+    if not is_valid_time_format(clip.end_timestamp):
+        print(
+            f"Invalid '{KEY_END}' timestamp for clip {clip.end_timestamp}. Should be of the form 'HH:MM:SS'"
+        )
+        return False
+
+    return True
+
+
 def check_ffmpeg_installed() -> bool:
     try:
         subprocess.run(
@@ -251,18 +507,137 @@ def check_ffmpeg_installed() -> bool:
     return True
 
 
+def advise_sequential_read(fd: int):
+    """Ask the kernel to read ahead aggressively, the whole file is about to
+    be read once. Only available on Linux and some BSDs
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+
+def advise_done_reading(fd: int):
+    """Drop the file from the page cache so hashing many large clips does not
+    evict everything else
+    """
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
 def sha25_hash_of_file(filepath: Path) -> str:
-    hasher = hashlib.sha256()
-
-    with filepath.open("rb") as f:
-        while True:
-            data = f.read(131072)
-            if not data:
-                break
-            hasher.update(data)
+    # Checksums only detect changed clips, they are not a security boundary.
+    # hashlib.new prefers OpenSSL's implementation which uses SHA-NI if present
+    hasher = hashlib.new("sha256", usedforsecurity=False)
+
+    with filepath.open("rb", buffering=0) as f:
+        advise_sequential_read(f.fileno())
+
+        # sys.maxsize keeps files that do not fit a 32-bit address space
+        # on the streamed path
+        size = os.fstat(f.fileno()).st_size
+        if SHA256_MMAP_THRESHOLD_BYTES < size <= sys.maxsize:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                hasher.update(mm)
+        elif sys.version_info >= (3, 11) and size <= sys.maxsize:
+            hashlib.file_digest(f, lambda: hasher)
+        else:
+            buffer = bytearray(SHA256_CHUNK_BYTES)
+            view = memoryview(buffer)
+            while True:
+                n_read = f.readinto(buffer)
+                if not n_read:
+                    break
+                hasher.update(view[:n_read])
+
+        advise_done_reading(f.fileno())
     return hasher.hexdigest()
 
 
+def blake3_hash_of_file(filepath: Path) -> str:
+    # update_mmap hashes in Rust without the GIL, spread over all cores.
+    # It opens the file itself, the fd here is only for the cache advice
+    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    with filepath.open("rb", buffering=0) as f:
+        advise_sequential_read(f.fileno())
+        hasher.update_mmap(filepath)
+        advise_done_reading(f.fileno())
+    return hasher.hexdigest()
+
+
+def hash_of_file(filepath: Path, hash_alg: str) -> str:
+    if hash_alg == HASH_ALG_BLAKE3:
+        return blake3_hash_of_file(filepath)
+    return sha25_hash_of_file(filepath)
+
+
+def new_hasher(hash_alg: str):
+    """Incremental hasher for data that is not in a file yet"""
+    if hash_alg == HASH_ALG_BLAKE3:
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new("sha256", usedforsecurity=False)
+
+
+def hash_files(
+    filepaths: Iterable[tuple[Path, str]],
+    hash_cache: "HashCache | None" = None,
+) -> Iterator[str]:
+    """Hash (filepath, hash_alg) pairs concurrently, yielding digests in order.
+
+    hashlib and blake3 release the GIL while hashing large buffers, so
+    threads scale across cores and overlap disk reads with hashing. filepaths
+    is consumed lazily and at most 2 hashes per worker are in flight, so
+    memory does not grow with the number of files.
+    """
+    hash_file = hash_of_file if hash_cache is None else hash_cache.hash_file
+    workers = os.cpu_count() or 1
+    pending: deque[Future[str]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for filepath, hash_alg in filepaths:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(hash_file, filepath, hash_alg))
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def copy_file(src: Path, dst: Path):
+    """shutil.copy2, but copy in the kernel with copy_file_range on Linux.
+    That never moves the bytes through user space and can reflink on
+    btrfs/XFS
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                while os.copy_file_range(
+                    fsrc.fileno(), fdst.fileno(), 1 << 30
+                ):
+                    pass
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # Not supported for this filesystem or kernel
+            pass
+
+    shutil.copy2(src, dst)
+
+
+def backup_manifest(manifest_path: Path):
+    """Save the current manifest as *.backup. A hardlink is free, copy only
+    if the filesystem does not support them
+    """
+    backup_path = Path(f"{manifest_path}.backup")
+    backup_path.unlink(missing_ok=True)
+    try:
+        # link() does not follow symlinks, link the manifest's contents
+        os.link(manifest_path.resolve(), backup_path)
+    except OSError:
+        copy_file(manifest_path, backup_path)
+
+
 def save_manifest(
     manifest: VideoClipperManifest,
     manifest_path: Path,
@@ -275,75 +650,429 @@ def save_manifest(
         return
 
     if not no_backup:
-        shutil.copy2(manifest_path, f"{manifest_path}.backup")
+        backup_manifest(manifest_path)
+
+    # Write a new file and swap it in. The old manifest is never modified,
+    # so a crash cannot truncate it and a hardlinked backup stays intact.
+    # Swap in at the resolved path so a symlinked manifest stays a symlink
+    target_path = manifest_path.resolve()
+    tmp_path = Path(f"{target_path}.tmp")
+
+    # Both encoders produce identical bytes, orjson is just faster
+    manifest_json = manifest.to_json()
+    if orjson is not None:
+        with open(tmp_path, "wb") as json_file:
+            json_file.write(
+                orjson.dumps(manifest_json, option=orjson.OPT_INDENT_2)
+            )
+    else:
+        # json.dump would write every small token separately through the
+        # text layer, encoding once and writing once is faster
+        with open(tmp_path, "w", encoding="utf-8") as json_file:
+            json_file.write(
+                json.dumps(manifest_json, indent=2, ensure_ascii=False)
+            )
 
-    with open(manifest_path, "w") as json_file:
-        json.dump(manifest.to_json(), json_file, indent=4, sort_keys=False)
+    # The new file would otherwise get umask permissions
+    shutil.copymode(target_path, tmp_path)
+    os.replace(tmp_path, target_path)
 
 
 def is_valid_time_format(timestamp: str) -> bool:
-    if not re.match(r"^\d{2}:\d{2}:\d{2}$", timestamp):
+    if (
+        len(timestamp) != 8
+        or timestamp[2] != ":"
+        or timestamp[5] != ":"
+        or not timestamp.isascii()
+    ):
+        return False
+
+    hours, minutes, seconds = timestamp[0:2], timestamp[3:5], timestamp[6:8]
+    if not (hours.isdigit() and minutes.isdigit() and seconds.isdigit()):
         return False
-    hours, minutes, seconds = map(int, timestamp.split(":"))
-    return 0 <= hours <= 24 and 0 <= minutes <= 60 and 0 <= seconds <= 60
+    return int(hours) <= 24 and int(minutes) <= 59 and int(seconds) <= 59
 
 
-def should_clip_video(
-    clip: VideoClip, output_path: Path, overwrite: bool
-) -> bool:
-    """Does a clip need to be overwritten and is it allowed?
+def find_clips_to_create(
+    all_clips_with_file: Iterable[tuple[VideoFile, VideoClip]],
+    output_path: Path,
+    overwrite: bool,
+    hash_cache: "HashCache | None" = None,
+) -> list[tuple[VideoFile, VideoClip]]:
+    """Which clips need to be (over)written and are allowed to be?
 
-    Called within tqdm iterator so use tqdm.write
+    Existing clips are only hashed with `overwrite`, and then concurrently.
+    Unless caching is disabled (no `hash_cache`), clips whose size and mtime
+    match the manifest are trusted without hashing. Clips whose hash matches
+    get their size and mtime recorded so the next run can trust them
     """
+    output_listing = DirectoryListing()
+    clips_to_create: list[tuple[VideoFile, VideoClip]] = []
+    # The filepath is kept with each clip so it is only built once
+    existing_clips: list[
+        tuple[VideoFile, VideoClip, Path, os.stat_result]
+    ] = []
+
+    for video, clip in all_clips_with_file:
+        clip_filepath = clip.get_filepath(output_path)
+        clip_entry = output_listing.get_entry(clip_filepath)
+        if clip_entry is None and not clip_filepath.exists():
+            clips_to_create.append((video, clip))
+            continue
 
-    if not clip.get_filepath(output_path).exists():
-        return True
+        if not overwrite:
+            # Could still check the hash and report, but if you really want that, just use `validate`
+            continue
 
-    if not overwrite:
-        # Could still check the hash and report, but if you really want that, just use `validate`
-        return False
+        # Taken before hashing, so a write during hashing changes the mtime
+        if clip_entry is None:
+            clip_stat = clip_filepath.stat()
+        else:
+            clip_stat = clip_entry.stat()
+        if hash_cache is not None and clip.is_unchanged(clip_stat):
+            continue
+
+        existing_clips.append((video, clip, clip_filepath, clip_stat))
 
-    current_clip_hash = sha25_hash_of_file(clip.get_filepath(output_path))
-    if current_clip_hash == clip.sha256_checksum:
+    current_hashes = hash_files(
+        (
+            (clip_filepath, clip.hash_alg)
+            for _, clip, clip_filepath, _ in existing_clips
+        ),
+        hash_cache,
+    )
+    for (video, clip, clip_filepath, clip_stat), current_clip_hash in tqdm(
+        zip(existing_clips, current_hashes),
+        total=len(existing_clips),
+        desc="Hashing existing clips",
+        # Without --overwrite nothing is hashed, do not draw an empty bar
+        disable=not existing_clips,
+    ):
+        if current_clip_hash == clip.sha256_checksum:
+            clip.size = clip_stat.st_size
+            clip.mtime_ns = clip_stat.st_mtime_ns
+            continue
+
+        tqdm.write(
+            f"Hash mismatch for clip {clip_filepath}. Expected {clip.sha256_checksum} Found {current_clip_hash}"
+        )
+        clips_to_create.append((video, clip))
+
+    return clips_to_create
+
+
+def ffmpeg_clip_input_args(
+    video: VideoFile, clip: VideoClip, input_path: Path
+) -> list[str]:
+    """Seek on the input so ffmpeg jumps to the keyframe before the start"""
+    return [
+        "-ss",
+        clip.start_timestamp,
+        "-to",
+        clip.end_timestamp,
+        "-i",
+        str(video.get_filepath(input_path)),
+    ]
+
+
+def ffmpeg_clip_map_args(input_idx: int) -> list[str]:
+    """The streams of input input_idx that go into its clip in a batch: the
+    first video and the first audio stream, if present.
+
+    ffmpeg's default selection picks from all inputs, so every output of a
+    batch would get the first clip. For sources where
+    ffmpeg_default_streams_are_mapped holds, these maps select the same streams
+    """
+    return ["-map", f"{input_idx}:V:0?", "-map", f"{input_idx}:a:0?"]
+
+
+def ffmpeg_default_streams_are_mapped(video_filepath: Path) -> bool:
+    """Whether ffmpeg_clip_map_args picks the same streams as ffmpeg's default
+    selection does for a single clip. Only certain for sources with at most one
+    video and one audio stream and nothing else, `False` if ffprobe is missing
+    """
+    try:
+        process = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "stream=codec_type:stream_disposition=attached_pic",
+                "-of",
+                "json",
+                str(video_filepath),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        streams = json.loads(process.stdout).get("streams", [])
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
         return False
 
-    tqdm.write(
-        f"Hash mismatch for clip {clip.get_filepath(output_path)}. Expected {clip.sha256_checksum} Found {current_clip_hash}"
+    codec_types = [stream.get("codec_type") for stream in streams]
+    if any(
+        stream.get("disposition", {}).get("attached_pic") for stream in streams
+    ):
+        return False
+    return (
+        set(codec_types) <= {"video", "audio"}
+        and codec_types.count("video") <= 1
+        and codec_types.count("audio") <= 1
     )
 
-    return True
+
+def ffmpeg_clip_cmd(
+    video: VideoFile, clip: VideoClip, input_path: Path
+) -> list[str]:
+    """ffmpeg arguments to stream copy a clip, without the output"""
+    return [
+        "ffmpeg",
+        "-nostdin",
+        # Only errors are ever shown, skip buffering progress output
+        "-loglevel",
+        "error",
+        *ffmpeg_clip_input_args(video, clip, input_path),
+        "-c",
+        "copy",
+    ]
+
+
+def ffmpeg_clip_batch_cmd(
+    video: VideoFile,
+    clips: list[VideoClip],
+    input_path: Path,
+    output_path: Path,
+) -> list[str]:
+    """ffmpeg arguments to stream copy several clips of one video at once.
+
+    Every clip opens the video as its own input with the same -ss/-to as
+    ffmpeg_clip_cmd. Only for videos where ffmpeg_default_streams_are_mapped
+    holds, so the clips are identical to cutting them one by one
+    """
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-y"]
+    for clip in clips:
+        cmd += ffmpeg_clip_input_args(video, clip, input_path)
+
+    for input_idx, clip in enumerate(clips):
+        cmd += ffmpeg_clip_map_args(input_idx)
+        cmd += ["-c", "copy", str(clip.get_filepath(output_path))]
+    return cmd
 
 
 def clip_video(
-    video: VideoFile, clip: VideoClip, input_path: Path, output_path: Path
-):
+    video: VideoFile,
+    clip: VideoClip,
+    input_path: Path,
+    output_path: Path,
+) -> bool:
+    """Returns whether the clip was created. A failed clip is removed"""
+    clip_filepath = clip.get_filepath(output_path)
     try:
-        cmd = [
-            "ffmpeg",
-            "-ss",
-            clip.start_timestamp,
-            "-to",
-            clip.end_timestamp,
-            "-i",
-            str(video.get_filepath(input_path)),
-            "-c",
-            "copy",
-            str(clip.get_filepath(output_path)),
+        cmd = ffmpeg_clip_cmd(video, clip, input_path) + [
+            str(clip_filepath),
             "-y",
         ]
 
-        tqdm.write(f"Creating clip {clip.get_filepath(output_path)}")
+        tqdm.write(f"Creating clip {clip_filepath}")
+        # stderr is only decoded if it is going to be shown
         process = subprocess.run(
-            cmd, capture_output=True, text=True, check=False
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
         )
 
         if process.returncode != 0:
-            tqdm.write(
-                f"Error creating clip {clip.get_filepath(output_path)}: {process.stderr}"
-            )
+            stderr = process.stderr.decode(errors="replace")
+            tqdm.write(f"Error creating clip {clip_filepath}: {stderr}")
+            clip_filepath.unlink(missing_ok=True)
+            return False
 
     except subprocess.CalledProcessError as e:
         tqdm.write(f"Error creating clip: {e}")
+        return False
+
+    return True
+
+
+def clip_video_streamed(
+    video: VideoFile,
+    clip: VideoClip,
+    input_path: Path,
+    output_path: Path,
+    ffmpeg_format: str,
+    hash_alg: str = DEFAULT_HASH_ALG,
+) -> "str | None":
+    """Like clip_video, but ffmpeg writes to a pipe and the clip is hashed as
+    it is written to disk, so it never has to be read back. Returns the
+    hash_alg checksum, `None` if the clip could not be created
+    """
+    clip_filepath = clip.get_filepath(output_path)
+    cmd = ffmpeg_clip_cmd(video, clip, input_path) + [
+        "-f",
+        ffmpeg_format,
+        "pipe:1",
+    ]
+    hasher = new_hasher(hash_alg)
+
+    tqdm.write(f"Creating clip {clip_filepath}")
+    # stderr goes to a file so a chatty ffmpeg cannot fill the pipe and
+    # block while stdout is being read
+    with tempfile.TemporaryFile() as stderr_file:
+        with subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=stderr_file
+        ) as process:
+            with clip_filepath.open("wb") as clip_file:
+                while data := process.stdout.read(SHA256_CHUNK_BYTES):
+                    hasher.update(data)
+                    clip_file.write(data)
+
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            tqdm.write(f"Error creating clip {clip_filepath}: {stderr}")
+            # Whatever reached the pipe is not a usable clip
+            clip_filepath.unlink(missing_ok=True)
+            return None
+
+    return hasher.hexdigest()
+
+
+def clip_video_batch(
+    video: VideoFile,
+    clips: list[VideoClip],
+    input_path: Path,
+    output_path: Path,
+) -> bool:
+    """Like clip_video for several clips of the same video in one process.
+    If ffmpeg fails, none of the clips are kept
+    """
+    cmd = ffmpeg_clip_batch_cmd(video, clips, input_path, output_path)
+
+    for clip in clips:
+        tqdm.write(f"Creating clip {clip.get_filepath(output_path)}")
+    process = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+
+    if process.returncode != 0:
+        stderr = process.stderr.decode(errors="replace")
+        clip_filepaths = ", ".join(
+            str(clip.get_filepath(output_path)) for clip in clips
+        )
+        tqdm.write(f"Error creating clips {clip_filepaths}: {stderr}")
+        for clip in clips:
+            clip.get_filepath(output_path).unlink(missing_ok=True)
+        return False
+
+    return True
+
+
+def create_clip(
+    video: VideoFile,
+    clip: VideoClip,
+    input_path: Path,
+    output_path: Path,
+    hash_alg: str = DEFAULT_HASH_ALG,
+) -> tuple[bool, "str | None"]:
+    """Create the clip. Returns whether it was created and, for streamable
+    formats that are hashed while they are written, its hash_alg checksum
+    """
+    clip_filepath = clip.get_filepath(output_path)
+
+    ffmpeg_format = STREAMABLE_CLIP_FORMATS.get(clip_filepath.suffix.lower())
+    if ffmpeg_format is not None:
+        sha256_checksum = clip_video_streamed(
+            video,
+            clip,
+            input_path,
+            output_path,
+            ffmpeg_format,
+            hash_alg,
+        )
+        return sha256_checksum is not None, sha256_checksum
+
+    return clip_video(video, clip, input_path, output_path), None
+
+
+def create_clips(
+    video: VideoFile,
+    clips: list[VideoClip],
+    input_path: Path,
+    output_path: Path,
+    hash_alg: str = DEFAULT_HASH_ALG,
+) -> list[tuple[bool, "str | None"]]:
+    """create_clip for a batch from batch_clips_by_video. Clips of videos
+    whose streams a batch cannot select like a single clip are cut one by one
+    """
+    if len(clips) == 1 or not ffmpeg_default_streams_are_mapped(
+        video.get_filepath(input_path)
+    ):
+        return [
+            create_clip(video, clip, input_path, output_path, hash_alg)
+            for clip in clips
+        ]
+
+    created = clip_video_batch(video, clips, input_path, output_path)
+    return [(created, None)] * len(clips)
+
+
+def batch_clips_by_video(
+    clips_to_create: list[tuple[VideoFile, VideoClip]],
+) -> list[tuple[VideoFile, list[VideoClip]]]:
+    """Group clips of the same video so one ffmpeg process cuts several.
+    Streamed clips each need ffmpeg's stdout and stay on their own
+    """
+    batches: list[tuple[VideoFile, list[VideoClip]]] = []
+    open_batches: dict[str, list[VideoClip]] = {}
+
+    for video, clip in clips_to_create:
+        if Path(clip.filename).suffix.lower() in STREAMABLE_CLIP_FORMATS:
+            batches.append((video, [clip]))
+            continue
+
+        clips = open_batches.get(video.filename)
+        if clips is None or len(clips) >= FFMPEG_MAX_CLIPS_PER_PROCESS:
+            clips = []
+            open_batches[video.filename] = clips
+            batches.append((video, clips))
+        clips.append(clip)
+
+    return batches
+
+
+def hash_created_clip(
+    clip_filepath: Path,
+    sha256_checksum: "str | None",
+    hash_alg: str,
+    hash_cache: "HashCache | None" = None,
+) -> tuple[str, os.stat_result]:
+    """hash_alg checksum and stat of a clip create_clip just wrote. Only
+    reads the clip if create_clip did not already hash it
+    """
+    clip_stat = clip_filepath.stat()
+    if sha256_checksum is not None:
+        if hash_cache is not None:
+            hash_cache.add(clip_filepath, clip_stat, sha256_checksum, hash_alg)
+    elif hash_cache is None:
+        sha256_checksum = hash_of_file(clip_filepath, hash_alg)
+    else:
+        sha256_checksum = hash_cache.hash_file(
+            clip_filepath, hash_alg, clip_stat
+        )
+    return sha256_checksum, clip_stat
+
+
+def default_clip_jobs() -> int:
+    """`-c copy` is disk bound, so more ffmpeg processes than half the
+    cores only thrash the disk
+    """
+    return max(1, (os.cpu_count() or 1) // 2)
 
 
 def add_command(args: argparse.Namespace) -> bool:
@@ -384,6 +1113,16 @@ def clip_command(args: argparse.Namespace) -> bool:
     if args.overwrite:
         print("Warning: Will overwrite existing clips if hashes do not match")
 
+    jobs = default_clip_jobs() if args.jobs is None else args.jobs
+    if jobs < 1:
+        print("Error: --jobs must be at least 1")
+        return False
+
+    hash_alg = DEFAULT_HASH_ALG if args.hash_algo is None else args.hash_algo
+    if hash_alg == HASH_ALG_BLAKE3 and blake3 is None:
+        print("Error: --hash-algo blake3 requires the blake3 package")
+        return False
+
     # Check if original dir
     if not input_dir.exists() or not input_dir.is_dir():
         print("Error: input-dir must be an already existing directory")
@@ -405,31 +1144,97 @@ def clip_command(args: argparse.Namespace) -> bool:
         print("Nothing to process!")
         return False
 
-    all_clips_with_file = [
-        (video, clip)
-        for video in manifest.video_files.values()
-        for clip in video.clips.values()
-    ]
+    hash_cache = load_hash_cache(args.manifest, args.no_cache)
 
-    for video, clip in tqdm(all_clips_with_file, desc="Processing clips"):
-        if not should_clip_video(clip, output_dir, args.overwrite):
-            continue
+    if args.overwrite and not check_hash_algs_available(
+        clip for _, clip in manifest.iter_clips()
+    ):
+        return False
+
+    clips_to_create = find_clips_to_create(
+        manifest.iter_clips(), output_dir, args.overwrite, hash_cache
+    )
 
-        if args.dryrun:
-            tqdm.write(
+    if args.dryrun:
+        for video, clip in clips_to_create:
+            print(
                 f"Dryrun: would have clipped {video.get_filepath(input_dir)} -> {clip.get_filepath(output_dir)}"
             )
-            continue
-        clip_video(video, clip, input_dir, output_dir)
-
-        clip.sha256_checksum = sha25_hash_of_file(
-            clip.get_filepath(output_dir)
-        )
+        clips_to_create = []
+
+    # Threads rather than processes: workers mostly wait on ffmpeg and
+    # hashlib releases the GIL, so there is nothing to gain from pickling.
+    # Hashing has its own pool so an ffmpeg worker moves on to the next clip
+    # while the clip it just wrote is hashed, still hot in the page cache
+    with (
+        ThreadPoolExecutor(max_workers=jobs) as ffmpeg_executor,
+        ThreadPoolExecutor(max_workers=os.cpu_count()) as hash_executor,
+    ):
+        ffmpeg_futures = {
+            ffmpeg_executor.submit(
+                create_clips,
+                video,
+                clips,
+                input_dir,
+                output_dir,
+                hash_alg,
+            ): clips
+            for video, clips in batch_clips_by_video(clips_to_create)
+        }
+        hash_futures: dict[Future[tuple[str, os.stat_result]], VideoClip] = {}
+        n_failed = 0
+        # A run with nothing to create should not draw empty bars
+        with tqdm(
+            total=len(clips_to_create),
+            desc="Processing clips",
+            disable=not clips_to_create,
+        ) as bar:
+            for future in as_completed(ffmpeg_futures):
+                clips = ffmpeg_futures[future]
+                for clip, (created, sha256_checksum) in zip(
+                    clips, future.result()
+                ):
+                    # A failed clip keeps its previous manifest entry. Its
+                    # file was removed, so the next run creates it again
+                    if not created:
+                        n_failed += 1
+                        continue
+                    hash_future = hash_executor.submit(
+                        hash_created_clip,
+                        clip.get_filepath(output_dir),
+                        sha256_checksum,
+                        hash_alg,
+                        hash_cache,
+                    )
+                    hash_futures[hash_future] = clip
+                bar.update(len(clips))
+
+        for future in tqdm(
+            as_completed(hash_futures),
+            total=len(hash_futures),
+            desc="Hashing clips",
+            disable=not hash_futures,
+        ):
+            clip = hash_futures[future]
+            clip.sha256_checksum, clip_stat = future.result()
+            clip.hash_alg = hash_alg
+            clip.size = clip_stat.st_size
+            clip.mtime_ns = clip_stat.st_mtime_ns
 
     save_manifest(
-        manifest, args.manifest, no_backup=args.no_backup, dryrun=args.dryrun
+        manifest,
+        args.manifest,
+        no_backup=args.no_backup,
+        dryrun=args.dryrun,
+    )
+    save_hash_cache(
+        hash_cache, args.manifest, manifest, output_dir, dryrun=args.dryrun
     )
 
+    if n_failed > 0:
+        print(f"Failed to create {n_failed} clips")
+        return False
+
     return True
 
 
@@ -455,19 +1260,45 @@ def validate_command(args: argparse.Namespace) -> bool:
             )
             return False
 
-        all_clips = [
-            clip
-            for video_file in manifest.video_files.values()
-            for clip in video_file.clips.values()
-        ]
+        if not check_hash_algs_available(
+            clip for _, clip in manifest.iter_clips()
+        ):
+            return False
 
-        for clip in tqdm(all_clips, desc="Hashing clips"):
-            current_hash = sha25_hash_of_file(clip.get_filepath(output_dir))
+        # A clip whose size changed cannot match, no need to read it
+        clips_to_hash: list[tuple[VideoClip, Path]] = []
+        for _, clip in manifest.iter_clips():
+            clip_filepath = clip.get_filepath(output_dir)
+            if clip.size is not None:
+                current_size = clip_filepath.stat().st_size
+                if current_size != clip.size:
+                    print(
+                        f"Mismatched size for clip {clip_filepath}!\nExpected {clip.size} bytes Got {current_size}"
+                    )
+                    valid = False
+                    continue
+            clips_to_hash.append((clip, clip_filepath))
+
+        hash_cache = load_hash_cache(args.manifest, args.no_cache)
+        current_hashes = hash_files(
+            (
+                (clip_filepath, clip.hash_alg)
+                for clip, clip_filepath in clips_to_hash
+            ),
+            hash_cache,
+        )
+        for (clip, clip_filepath), current_hash in tqdm(
+            zip(clips_to_hash, current_hashes),
+            total=len(clips_to_hash),
+            desc="Hashing clips",
+        ):
             if clip.sha256_checksum != current_hash:
                 tqdm.write(
-                    f"Mismatched checksum for clip {clip.get_filepath(output_dir)}!\nExpected {clip.sha256_checksum} Got {current_hash}"
+                    f"Mismatched checksum for clip {clip_filepath}!\nExpected {clip.sha256_checksum} Got {current_hash}"
                 )
                 valid = False
+
+        save_hash_cache(hash_cache, args.manifest, manifest, output_dir)
     else:
         print("Skipping checksum validation")
 
@@ -477,6 +1308,29 @@ def validate_command(args: argparse.Namespace) -> bool:
     return valid
 
 
+def looks_like_clip(
+    filename: str, video_stems_by_suffix: dict[str, set[str]]
+) -> bool:
+    """Could filename have been generated for a video? Same as globbing
+    "{video stem}_[0-9]*{video suffix}" for every video
+    """
+    # TODO: not exactly right, but close enough
+    for suffix, stems in video_stems_by_suffix.items():
+        if not filename.endswith(suffix):
+            continue
+        # The "_" before the index can be any "_" followed by a digit, the
+        # video stem may contain "_" itself
+        end = len(filename) - len(suffix)
+        sep_idx = filename.find("_")
+        while 0 <= sep_idx < end - 1:
+            if filename[sep_idx + 1] in "0123456789" and (
+                filename[:sep_idx] in stems
+            ):
+                return True
+            sep_idx = filename.find("_", sep_idx + 1)
+    return False
+
+
 def prune_command(args: argparse.Namespace) -> bool:
     # for intellisense
     output_dir: Path = args.output_dir
@@ -491,21 +1345,23 @@ def prune_command(args: argparse.Namespace) -> bool:
         for clip_name in video.clips
     }
 
-    matching_filepaths: set[Path] = set()
+    video_stems_by_suffix: dict[str, set[str]] = {}
     for video_name in manifest.video_files:
         video_as_path = Path(video_name)
-        # clips looks like "{video_name}_{idx}.{video_extension}"
-        # TODO: not exactly right, but close enough
-        glob_result = output_dir.glob(
-            f"{video_as_path.stem}_[0-9]*{video_as_path.suffix}"
+        video_stems_by_suffix.setdefault(video_as_path.suffix, set()).add(
+            video_as_path.stem
         )
 
-        for match in glob_result:
-            if match.name in known_clip_names:
-                continue
-            if not match.is_file():
-                continue
-            matching_filepaths.add(match)
+    # One directory read for all videos instead of a glob per video
+    matching_filepaths: set[Path] = set()
+    for entry in scan_directory(output_dir).values():
+        if entry.name in known_clip_names:
+            continue
+        if not looks_like_clip(entry.name, video_stems_by_suffix):
+            continue
+        if not entry.is_file():
+            continue
+        matching_filepaths.add(Path(entry.path))
 
     if len(matching_filepaths) == 0:
         print(
@@ -614,11 +1470,31 @@ def main():
         action="store_true",
         help="Only print, do not modify/create files",
     )
+    clip_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of ffmpeg processes to run at once. "
+        "Defaults to half the CPU cores",
+    )
+    clip_parser.add_argument(
+        "--hash-algo",
+        choices=[HASH_ALG_SHA256, HASH_ALG_BLAKE3],
+        help="Checksum algorithm for new clips. Existing clips are verified "
+        "with the algorithm they were hashed with. "
+        "Defaults to blake3 if installed, otherwise sha256",
+    )
     clip_parser.add_argument(
         "--no-backup",
         action="store_true",
         help="Do not save a *.backup of your manifest before editing",
     )
+    clip_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always hash clips instead of reusing checksums of clips whose "
+        "mtime and size are unchanged",
+    )
 
     ## Validate Parser
     validate_parser = subparsers.add_parser(
@@ -640,7 +1516,15 @@ def main():
     validate_parser.add_argument(
         "--checksum",
         action="store_true",
-        help="Compare the clip checksum with the actual sha256 hash of the clip",
+        help="Compare the clip checksum with the actual hash of the clip. "
+        "Clips whose mtime and size are unchanged reuse their cached hash, "
+        "so corruption that keeps both is only found with --no-cache",
+    )
+    validate_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always hash clips instead of reusing checksums of clips whose "
+        "mtime and size are unchanged",
     )
 
     ## Prune command